@@ -0,0 +1,50 @@
+"""Production serving profile for portfolio.py.
+
+    gunicorn                              # WSGI, gthread workers
+    PORTFOLIO_SERVER=asgi gunicorn        # ASGI, uvicorn workers
+
+Settings come from the environment:
+    PORTFOLIO_BIND      address to listen on (default 0.0.0.0:8000)
+    PORTFOLIO_WORKERS   worker processes (default 2 * CPUs + 1)
+    PORTFOLIO_THREADS   threads per WSGI worker (default 4)
+    PORTFOLIO_SERVER    "wsgi" (default) or "asgi"
+
+The app is imported once in the master (preload_app), which compiles the
+template and renders and compresses the page before any worker forks.
+
+Graceful reload: `kill -HUP <master pid>` replaces the workers after their
+in-flight requests finish. Preloaded code is not re-imported on HUP; to
+deploy new code send USR2 (start a new master) and then QUIT to the old one.
+Content edits need neither, as each worker watches portfolio.json itself.
+"""
+import gc
+import multiprocessing
+import os
+
+_server = os.environ.get("PORTFOLIO_SERVER", "wsgi")
+if _server not in ("wsgi", "asgi"):
+    raise ValueError(f"PORTFOLIO_SERVER must be 'wsgi' or 'asgi', got {_server!r}")
+
+bind = os.environ.get("PORTFOLIO_BIND", "0.0.0.0:8000")
+workers = int(os.environ.get("PORTFOLIO_WORKERS", multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.environ.get("PORTFOLIO_THREADS", 4))
+
+if _server == "asgi":
+    wsgi_app = "portfolio_asgi:app"
+    worker_class = "uvicorn.workers.UvicornWorker"
+else:
+    wsgi_app = "portfolio:app"
+    worker_class = "gthread"
+
+preload_app = True
+graceful_timeout = 30
+keepalive = 5
+
+
+def on_starting(server):
+    import portfolio
+
+    portfolio.warm_cache()
+    # Keep the preloaded heap out of the collector so workers don't touch
+    # (and un-share) those pages while scanning it
+    gc.freeze()
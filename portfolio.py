@@ -1,119 +1,155 @@
-from flask import Flask, render_template_string
+import gzip
+import hashlib
+import io
+import json
+import os
+import re
+import sys
+import threading
+import time
+import urllib.parse
+import urllib.request
+from dataclasses import dataclass
+
+from flask import Flask, Response, request
+
+import portfolio_metrics
+from portfolio_metrics import phase
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    from fontTools import subset as font_subset
+    from fontTools.ttLib import TTFont
+except ImportError:
+    font_subset = None
 
 app = Flask(__name__)
-
-# Portfolio data with image
-portfolio_data = {
-    "name": "Ruchika Mahajan",
-    "tagline": "Student | Web Developer | AI Developer | Tech Enthusiast",
-    "about": "Creative tech enthusiast with a strong foundation in Mathematics and Electrical Engineering, passionate about building secure, scalable, and user-centric digital experiences. I bridge deep learning, embedded systems, and full-stack development to deliver impactful, real-time solutions.",
-    "image_url": "https://drive.google.com/thumbnail?id=19o1zgF8yV5UxDQoVlNmHe08wpKk_aLrc",  # Added image URL (replace with your actual image)
-    "skills": {
-        "Programming Languages": ["Python (Advanced)", "C/C++", "R"],
-        "Machine Learning": ["TensorFlow", "PyTorch", "scikit-learn", "OpenCV"],
-        "Web Development": ["Flask", "HTML/CSS", "Firebase"],
-        "Data Science": ["Pandas", "NumPy", "Matplotlib"],
-        "Hardware Technologies": ["Cadence", "Verilog", "TCAD", "Pspice"],
-        "Database Management": ["MySQL"]
-    },
-    "experience": [
-        {
-            "title": "Gimbal Space | Embedded Systems Intern",
-            "description": [
-                "Developed and tested embedded C/C++ firmware for microcontroller-based systems, improving hardware response time by 15%.",
-                "Designed and executed 10+ real-time simulations using hardware-in-the-loop (HIL) setups.",
-                "Collaborated with a cross-functional team to debug and document system issues."
-            ],
-            "icon": "microchip"
-        },
-        {
-            "title": "Girl Power Talk | AI Research Intern",
-            "description": [
-                "Built a real-time document scanning system using OpenCV and Tesseract OCR with 92%+ accuracy.",
-                "Designed automated data pipelines with Firebase & Firestore, reducing manual handling by 60%.",
-                "Developed backend using Python and Flask, reducing API response time by 30%."
-            ],
-            "icon": "robot"
-        },
-        {
-            "title": "I Care Foundation | Software/Web Developer",
-            "description": [
-                "Developed cross-platform solutions integrating data from 5+ third-party APIs.",
-                "Automated reporting pipelines using cloud tools, reducing manual time by 70%.",
-                "Increased digital reach by 40% through automation-driven SEO strategies."
-            ],
-            "icon": "globe"
-        }
-    ],
-    "projects": [
-        {
-            "title": "Gesture Recognition for Prosthetic Arm",
-            "description": [
-                "Developed ML-based system using EMG signals from 8 subjects (44,000+ data points).",
-                "Achieved 95%+ classification accuracy for 8 distinct gestures.",
-                "Technologies: Python, MATLAB, EMG sensors"
-            ],
-            "color": "#4e79a7",
-            "icon": "hand-paper"
-        },
-        {
-            "title": "Fraud Detection Application",
-            "description": [
-                "Detects fraudulent transactions using Isolation Forest algorithm.",
-                "Utilizes synthetic data generation and preprocessing.",
-                "Technologies: Python, scikit-learn, Pandas"
-            ],
-            "color": "#e15759",
-            "icon": "shield-alt"
-        },
-        {
-            "title": "Sign Language Recognition",
-            "description": [
-                "Real-time system using webcam input with CNN-LSTM model (90%+ accuracy).",
-                "Reduced raw video data by 80% through landmark extraction.",
-                "Technologies: Python, TensorFlow, MediaPipe"
-            ],
-            "color": "#76b7b2",
-            "icon": "sign-language"
-        },
-        {
-            "title": "Alternative-Routes in Road Networks",
-            "description": [
-                "Simulates road network with dynamic traffic using Dijkstra's Algorithm.",
-                "Visualizations with NetworkX & Matplotlib.",
-                "Technologies: Python, NetworkX, Matplotlib"
-            ],
-            "color": "#f28e2b",
-            "icon": "road"
-        },
-        {
-            "title": "Real-Time Chat Application",
-            "description": [
-                "Flask and Socket.IO with instant messaging.",
-                "Built-in chatbot with predefined auto-responses.",
-                "Technologies: Flask, WebSockets, Python"
-            ],
-            "color": "#edc948",
-            "icon": "comments"
-        }
-    ],
-    "certifications": [
-        "Advanced to penultimate round of Walmart Sparkplug, Flipkart Grid, TVS Credit EPIC",
-        "Master Python, Python for Data Science, Web Development (Udemy)",
-        "ChatGPT and AI Tools (Skill Nation), AI for AI (IBM)",
-        "Data Science and Machine Learning (Edureka)"
-    ],
-    "contact": {
-        "email": "ruchikamahajan3007@gmail.com",
-        "phone": "+91-9729002208",
-        "location": "Delhi, India",
-        "github": "https://github.com/ruch-proj/Projects?tab=readme-ov-file#projects"
-    }
-}
-
-@app.route('/')
-def home():
-    return render_template_string('''
+# HTML is always revalidated; the ETag turns repeat visits into a 304
+app.config.setdefault("HOME_CACHE_CONTROL", "public, no-cache")
+
+CONTENT_PATH = os.environ.get(
+    "PORTFOLIO_CONTENT", os.path.join(os.path.dirname(os.path.abspath(__file__)), "portfolio.json")
+)
+
+
+@dataclass(frozen=True, slots=True)
+class SkillCategory:
+    name: str
+    skills: tuple
+
+
+@dataclass(frozen=True, slots=True)
+class Experience:
+    title: str
+    description: tuple
+    icon: str
+
+
+@dataclass(frozen=True, slots=True)
+class Project:
+    title: str
+    description: tuple
+    color: str
+    icon: str
+
+
+@dataclass(frozen=True, slots=True)
+class Contact:
+    email: str
+    phone: str
+    location: str
+    github: str
+
+
+@dataclass(frozen=True, slots=True)
+class Portfolio:
+    name: str
+    tagline: str
+    about: str
+    image_url: str
+    skills: tuple
+    experience: tuple
+    projects: tuple
+    certifications: tuple
+    contact: Contact
+
+
+def _field(raw, key, kind, where):
+    value = raw.get(key) if isinstance(raw, dict) else None
+    if not isinstance(value, kind):
+        raise ValueError(f"{where}.{key}: expected {kind.__name__}, got {type(value).__name__}")
+    return value
+
+
+def _strings(raw, key, where):
+    values = _field(raw, key, list, where)
+    for i, value in enumerate(values):
+        if not isinstance(value, str):
+            raise ValueError(f"{where}.{key}[{i}]: expected str, got {type(value).__name__}")
+    return tuple(values)
+
+
+def parse_portfolio(raw):
+    """Validate raw content (as loaded from JSON/TOML/YAML) into a Portfolio record."""
+    skills = _field(raw, "skills", dict, "portfolio")
+    contact = _field(raw, "contact", dict, "portfolio")
+    return Portfolio(
+        name=_field(raw, "name", str, "portfolio"),
+        tagline=_field(raw, "tagline", str, "portfolio"),
+        about=_field(raw, "about", str, "portfolio"),
+        image_url=raw.get("image_url") or "",
+        skills=tuple(
+            SkillCategory(name, _strings(skills, name, "portfolio.skills")) for name in skills
+        ),
+        experience=tuple(
+            Experience(
+                title=_field(job, "title", str, f"portfolio.experience[{i}]"),
+                description=_strings(job, "description", f"portfolio.experience[{i}]"),
+                icon=_field(job, "icon", str, f"portfolio.experience[{i}]"),
+            )
+            for i, job in enumerate(_field(raw, "experience", list, "portfolio"))
+        ),
+        projects=tuple(
+            Project(
+                title=_field(project, "title", str, f"portfolio.projects[{i}]"),
+                description=_strings(project, "description", f"portfolio.projects[{i}]"),
+                color=_field(project, "color", str, f"portfolio.projects[{i}]"),
+                icon=_field(project, "icon", str, f"portfolio.projects[{i}]"),
+            )
+            for i, project in enumerate(_field(raw, "projects", list, "portfolio"))
+        ),
+        certifications=_strings(raw, "certifications", "portfolio"),
+        contact=Contact(
+            email=_field(contact, "email", str, "portfolio.contact"),
+            phone=_field(contact, "phone", str, "portfolio.contact"),
+            location=_field(contact, "location", str, "portfolio.contact"),
+            github=_field(contact, "github", str, "portfolio.contact"),
+        ),
+    )
+
+
+def load_portfolio(path):
+    """Load and validate portfolio content from a .json, .toml or .yaml file."""
+    ext = os.path.splitext(path)[1].lower()
+    with open(path, "rb") as f:
+        if ext == ".toml":
+            import tomllib
+            raw = tomllib.load(f)
+        elif ext in (".yaml", ".yml"):
+            import yaml
+            raw = yaml.safe_load(f)
+        else:
+            raw = json.load(f)
+    return parse_portfolio(raw)
+
+
+portfolio_data = load_portfolio(CONTENT_PATH)
+
+PORTFOLIO_TEMPLATE = '''
 <!DOCTYPE html>
 <html lang="en">
 <head>
@@ -863,11 +899,11 @@ def home():
         <section class="skills fade-in delay-1">
             <h1>Technical Skills</h1>
             <div class="skills-container">
-                {% for category, skills in data.skills.items() %}
+                {% for category in data.skills %}
                 <div class="skill-category fade-in delay-{{ loop.index }}">
-                    <h3>{{ category }}</h3>
+                    <h3>{{ category.name }}</h3>
                     <ul>
-                        {% for skill in skills %}
+                        {% for skill in category.skills %}
                         <li>{{ skill }}</li>
                         {% endfor %}
                     </ul>
@@ -1003,7 +1039,396 @@ def home():
     </script>
 </body>
 </html>
-    ''', data=portfolio_data)
+    '''
+
+# Compile the template once at startup instead of on every request
+_compile_start = time.perf_counter()
+home_template = app.jinja_env.from_string(PORTFOLIO_TEMPLATE)
+portfolio_metrics.metrics.compile_seconds = time.perf_counter() - _compile_start
+
+# (data version, rendered page bytes, ETag) for the last render
+_data_version = 0
+_render_cache = (None, None, None)
+_render_lock = threading.Lock()
+# Compressed page bodies, keyed by (ETag, content-encoding)
+_encoded_cache = {}
+_encode_lock = threading.Lock()  # guards sweeping and filling _encoded_cache across threads
+
+
+def set_portfolio_data(data):
+    """Replace the portfolio content and invalidate the rendered page.
+
+    Content equal to what is already being served is ignored, so the page is
+    only re-rendered when something it shows has actually changed.
+    """
+    global portfolio_data, _data_version
+    with _render_lock:
+        if data == portfolio_data:
+            return False
+        portfolio_data = data
+        _data_version += 1
+        return True
+
+
+def watch_content(path=CONTENT_PATH, interval=1.0):
+    """Poll the content file and hot-swap portfolio_data when it changes.
+
+    Runs in a daemon thread. A file that fails to parse or validate is
+    reported and skipped; the last good content keeps being served.
+    """
+    def stamp():
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def run():
+        last = stamp()
+        while True:
+            time.sleep(interval)
+            current = stamp()
+            if current is None or current == last:
+                continue
+            last = current
+            try:
+                data = load_portfolio(path)
+            except Exception as e:
+                print(f"[WARN] Ignoring invalid content in {path}: {e}")
+                continue
+            if set_portfolio_data(data):
+                print(f"[INFO] Reloaded portfolio content from {path}")
+
+    thread = threading.Thread(target=run, name="portfolio-content-watcher", daemon=True)
+    thread.start()
+    return thread
+
+
+_watcher = None
+
+
+@app.before_request
+def _start_content_watcher():
+    # Started lazily so each (possibly forked) worker process gets its own thread
+    global _watcher
+    if _watcher is None and app.config.get("PORTFOLIO_WATCH", True):
+        with _render_lock:
+            if _watcher is None:
+                _watcher = watch_content()
+
+
+def _rendered_home():
+    """Return (body, etag) for the home page, rendering at most once per data version."""
+    global _render_cache
+    version, body, etag = _render_cache
+    if version == _data_version:
+        return body, etag
+    with _render_lock:
+        version, body, etag = _render_cache
+        if version != _data_version:
+            with phase("render"):
+                body = home_template.render(data=portfolio_data).encode("utf-8")
+            etag = hashlib.sha256(body).hexdigest()[:32]
+            _render_cache = (_data_version, body, etag)
+        return body, etag
+
+
+def render_home():
+    """Return the rendered home page as UTF-8 bytes."""
+    return _rendered_home()[0]
+
+
+def _encode(body, etag, encoding):
+    """Compress body with the given content-encoding, once per ETag."""
+    key = (etag, encoding)
+    data = _encoded_cache.get(key)
+    if data is None:
+        with phase("compress"):
+            if encoding == "br":
+                data = brotli.compress(body, quality=11)
+            else:
+                data = gzip.compress(body, compresslevel=9, mtime=0)
+        # Bodies for superseded renders are never served again
+        with _encode_lock:
+            for stale in [k for k in _encoded_cache if k[0] != etag]:
+                _encoded_cache.pop(stale, None)
+            _encoded_cache[key] = data
+    return data
+
+
+def warm_cache():
+    """Render and precompress the home page ahead of the first request.
+
+    Called in the pre-fork master so workers inherit the cache copy-on-write.
+    """
+    body, etag = _rendered_home()
+    _encode(body, etag, "gzip")
+    if brotli is not None:
+        _encode(body, etag, "br")
+
+
+@app.route('/')
+def home():
+    # Dev preview only; production serves the output of build_static()
+    body, page_etag = _rendered_home()
+    offered = ["br", "gzip", "identity"] if brotli is not None else ["gzip", "identity"]
+    encoding = request.accept_encodings.best_match(offered, default="identity")
+
+    # Each encoding is a distinct representation and needs its own strong ETag
+    etag = page_etag if encoding == "identity" else f"{page_etag}-{encoding}"
+    response = Response(mimetype='text/html')
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = app.config["HOME_CACHE_CONTROL"]
+    response.vary.add("Accept-Encoding")
+    if request.if_none_match.contains_weak(etag):
+        response.status_code = 304
+        return response
+
+    if encoding != "identity":
+        body = _encode(body, page_etag, encoding)
+        response.content_encoding = encoding
+    response.set_data(body)
+    return response
+
+
+portfolio_metrics.init_app(app)
+
+
+def _write_asset(path, data):
+    """Write data to path along with precompressed .gz and .br variants."""
+    with open(path, "wb") as f:
+        f.write(data)
+    with open(path + ".gz", "wb") as f:
+        # mtime=0 keeps the archive byte-identical across builds
+        with gzip.GzipFile(fileobj=f, mode="wb", compresslevel=9, mtime=0) as gz:
+            gz.write(data)
+    if brotli is not None:
+        with open(path + ".br", "wb") as f:
+            f.write(brotli.compress(data, quality=11))
+
+
+def _hashed_name(stem, ext, data):
+    return f"{stem}.{hashlib.sha256(data).hexdigest()[:12]}.{ext}"
+
+
+# External stylesheets linked from the template's <head>
+GOOGLE_FONTS_URL = "https://fonts.googleapis.com/css2?family=Poppins:wght@300;400;500;600;700&family=Playfair+Display:wght@400;500;600&family=Montserrat:wght@300;400;500&display=swap"
+FONT_AWESOME_URL = "https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0-beta3/css/all.min.css"
+# Google Fonts only serves woff2 to browsers it recognises
+_FONT_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36"
+_FONT_SUBSETS = ("latin", "latin-ext")
+
+
+def _fetch(url):
+    req = urllib.request.Request(url, headers={"User-Agent": _FONT_USER_AGENT})
+    with urllib.request.urlopen(req, timeout=30) as resp:
+        return resp.read()
+
+
+def _css_blocks(css):
+    """Split a stylesheet into its top-level (prelude, body) blocks."""
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    blocks, depth, start, body_start = [], 0, 0, 0
+    for i, ch in enumerate(css):
+        if ch == "{":
+            if depth == 0:
+                prelude, body_start = css[start:i].strip(), i + 1
+            depth += 1
+        elif ch == "}":
+            depth -= 1
+            if depth == 0:
+                blocks.append((prelude, css[body_start:i].strip()))
+                start = i + 1
+    return blocks
+
+
+def _selector_applies(selector, tags, classes):
+    """True if every element and class in selector occurs in the given markup."""
+    selector = re.sub(r"\[[^\]]*\]|::?[\w-]+(\([^)]*\))?", "", selector)
+    if any(tag not in tags for tag in re.findall(r"(?:^|[\s>+~])([a-z][a-z0-9]*)", selector)):
+        return False
+    return all(cls in classes for cls in re.findall(r"\.([\w-]+)", selector))
+
+
+def critical_css(css, html):
+    """Return the rules of css needed to paint the header and .hero section.
+
+    Rules are kept when all elements and classes in one of their selectors
+    appear above the fold. @media blocks are filtered recursively, and
+    @keyframes are kept only if a critical rule animates with them.
+    """
+    fold = re.sub(r"<style>.*?</style>", "", html, flags=re.S)
+    hero = fold.find('class="hero"')
+    fold = fold[:fold.find("</section>", hero)]
+    tags = set(re.findall(r"<([a-z][a-z0-9]*)", fold))
+    classes = {c for attr in re.findall(r'class="([^"]*)"', fold) for c in attr.split()}
+
+    def select(css):
+        kept, keyframes = [], []
+        for prelude, body in _css_blocks(css):
+            if prelude.startswith("@keyframes"):
+                keyframes.append((prelude, body))
+            elif prelude.startswith("@media"):
+                inner = select(body)
+                if inner:
+                    kept.append(f"{prelude}{{{inner}}}")
+            elif prelude.startswith("@"):
+                kept.append(f"{prelude}{{{body}}}")
+            else:
+                selectors = [s.strip() for s in prelude.split(",")]
+                selectors = [s for s in selectors if _selector_applies(s, tags, classes)]
+                if selectors:
+                    kept.append(f"{','.join(selectors)}{{{body}}}")
+        rules = "".join(kept)
+        for prelude, body in keyframes:
+            if re.search(rf"\b{re.escape(prelude.split()[-1])}\b", rules):
+                rules += f"{prelude}{{{body}}}"
+        return rules
+
+    return re.sub(r"\s+", " ", select(css))
+
+
+def _async_stylesheet(href):
+    """Load a stylesheet without blocking first paint."""
+    return (
+        f'<link rel="preload" href="{href}" as="style" onload="this.onload=null;this.rel=\'stylesheet\'">'
+        f'<noscript><link rel="stylesheet" href="{href}"></noscript>'
+    )
+
+
+def _self_host_fonts(fonts_dir):
+    """Download the Google Fonts files and return @font-face rules pointing at them."""
+    css = _fetch(GOOGLE_FONTS_URL).decode("utf-8")
+    # Keep only the unicode-range subsets the page's text can use
+    faces = re.findall(r"/\*\s*([\w-]+)\s*\*/\s*(@font-face\s*\{.*?\})", css, re.S)
+    faces = [face for subset, face in faces if subset in _FONT_SUBSETS] or re.findall(r"@font-face\s*\{.*?\}", css, re.S)
+    rules = []
+    for face in faces:
+        url = re.search(r"url\(([^)]+)\)", face).group(1).strip("'\"")
+        data = _fetch(url)
+        name = _hashed_name(os.path.splitext(os.path.basename(url))[0][:16], "woff2", data)
+        with open(os.path.join(fonts_dir, name), "wb") as f:
+            f.write(data)
+        face = face.replace(url, f"/assets/fonts/{name}")
+        face = re.sub(r"font-display:\s*\w+", "font-display: swap", face)
+        if "font-display" not in face:
+            face = face.replace("{", "{font-display: swap;", 1)
+        rules.append(re.sub(r"\s+", " ", face))
+    return "".join(rules)
+
+
+def _subset_woff2(data, codepoints):
+    font = TTFont(io.BytesIO(data))
+    options = font_subset.Options()
+    options.flavor = "woff2"
+    subsetter = font_subset.Subsetter(options)
+    subsetter.populate(unicodes=codepoints)
+    subsetter.subset(font)
+    out = io.BytesIO()
+    font.flavor = "woff2"
+    font.save(out)
+    return out.getvalue()
+
+
+def _subset_font_awesome(icons, fonts_dir):
+    """Return Font Awesome CSS reduced to the given icon names, with self-hosted fonts.
+
+    Icon rules for other icons are dropped; the base and utility rules are
+    kept. The webfonts are downloaded next to the stylesheet and, when
+    fontTools is installed, subset to the glyphs still referenced.
+    """
+    css = _fetch(FONT_AWESOME_URL).decode("utf-8")
+    kept, codepoints = [], set()
+    for prelude, body in _css_blocks(css):
+        names = re.findall(r"\.fa-([\w-]+)::?before", prelude)
+        content = re.search(r'content:\s*"\\([0-9a-f]+)"', body)
+        if names and content and len(names) == prelude.count(",") + 1:
+            names = [n for n in names if n in icons]
+            if not names:
+                continue
+            prelude = ",".join(f".fa-{n}:before" for n in names)
+            codepoints.add(int(content.group(1), 16))
+        kept.append(f"{prelude}{{{body}}}")
+    css = "".join(kept)
+
+    for url in set(re.findall(r"url\(([^)]+\.woff2)\)", css)):
+        data = _fetch(urllib.parse.urljoin(FONT_AWESOME_URL, url))
+        if font_subset is not None:
+            data = _subset_woff2(data, codepoints)
+        name = _hashed_name(os.path.splitext(os.path.basename(url))[0], "woff2", data)
+        with open(os.path.join(fonts_dir, name), "wb") as f:
+            f.write(data)
+        css = css.replace(url, f"/assets/fonts/{name}")
+    # Browsers that support woff2 never reach the legacy fallbacks
+    return re.sub(r",\s*url\([^)]+\.(?:ttf|woff|eot|svg)[^)]*\)\s*format\([^)]*\)", "", css)
+
+
+def build_static(out_dir="dist"):
+    """Render the home page to out_dir as index.html plus content-hashed CSS/JS.
+
+    Every file gets .gz and .br siblings (br only when the brotli package is
+    installed), so nginx can serve them with gzip_static / brotli_static.
+    Hashed asset names never change content and can be cached forever.
+
+    The CSS for the header and hero is inlined and everything else is loaded
+    asynchronously. Google Fonts and a Font Awesome build cut down to the
+    icons on the page are self-hosted. If they cannot be downloaded, the CDN
+    links are kept but still loaded asynchronously.
+    """
+    html = render_home().decode("utf-8")
+    assets_dir = os.path.join(out_dir, "assets")
+    fonts_dir = os.path.join(assets_dir, "fonts")
+    os.makedirs(fonts_dir, exist_ok=True)
+
+    try:
+        font_faces = _self_host_fonts(fonts_dir)
+    except OSError as e:
+        print(f"[WARN] Could not self-host Google Fonts ({e}); loading them from the CDN")
+        font_faces, fonts_link = "", _async_stylesheet(GOOGLE_FONTS_URL)
+    else:
+        fonts_link = ""
+    html = html.replace(f'<link href="{GOOGLE_FONTS_URL}" rel="stylesheet">', fonts_link)
+
+    icons = set(re.findall(r'class="fa[bsr]? fa-([\w-]+)"', html))
+    try:
+        icon_css = _subset_font_awesome(icons, fonts_dir).encode("utf-8")
+    except OSError as e:
+        print(f"[WARN] Could not subset Font Awesome ({e}); loading it from the CDN")
+        icons_link = _async_stylesheet(FONT_AWESOME_URL)
+    else:
+        icon_name = _hashed_name("icons", "css", icon_css)
+        _write_asset(os.path.join(assets_dir, icon_name), icon_css)
+        icons_link = _async_stylesheet(f"/assets/{icon_name}")
+    html = html.replace(f'<link rel="stylesheet" href="{FONT_AWESOME_URL}">', icons_link)
+
+    style = re.search(r"<style>(.*?)</style>", html, re.S)
+    css = style.group(1).strip()
+    critical = font_faces + critical_css(css, html)
+    css = css.encode("utf-8")
+    css_name = _hashed_name("style", "css", css)
+    _write_asset(os.path.join(assets_dir, css_name), css)
+    html = (
+        html[:style.start()]
+        + f"<style>{critical}</style>"
+        + _async_stylesheet(f"/assets/{css_name}")
+        + html[style.end():]
+    )
+
+    script = re.search(r"<script>(.*?)</script>", html, re.S)
+    js = script.group(1).strip().encode("utf-8")
+    js_name = _hashed_name("app", "js", js)
+    _write_asset(os.path.join(assets_dir, js_name), js)
+    html = html[:script.start()] + f'<script src="/assets/{js_name}"></script>' + html[script.end():]
+
+    _write_asset(os.path.join(out_dir, "index.html"), html.encode("utf-8"))
+    if brotli is None:
+        print("[WARN] brotli not installed; skipped .br variants")
+    print(f"[INFO] Static site written to {out_dir}")
+
 
 if __name__ == '__main__':
-    app.run(debug=True)
+    if len(sys.argv) > 1 and sys.argv[1] == "build":
+        build_static(sys.argv[2] if len(sys.argv) > 2 else "dist")
+    else:
+        # Development server only; production runs under gunicorn (see gunicorn.conf.py)
+        app.run(debug=True)
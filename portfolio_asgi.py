@@ -0,0 +1,10 @@
+"""ASGI entry point for the portfolio app.
+
+    uvicorn portfolio_asgi:app --workers 4
+    PORTFOLIO_SERVER=asgi gunicorn       # pre-fork with uvicorn workers, see gunicorn.conf.py
+"""
+from asgiref.wsgi import WsgiToAsgi
+
+from portfolio import app as wsgi_app
+
+app = WsgiToAsgi(wsgi_app)
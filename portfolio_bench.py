@@ -0,0 +1,269 @@
+"""Load-test and page-weight benchmark for the portfolio.py app.
+
+Starts the app in a subprocess, drives it with concurrent keep-alive clients
+and reports latency percentiles, throughput, server RSS and the size of the
+rendered page. Results can be saved as a baseline and later runs compared
+against it:
+
+    python portfolio_bench.py --save-baseline
+    python portfolio_bench.py            # exits non-zero on regression
+
+Scenarios:
+    cold        process start until the first page is served, then the latency of
+                the first compressed request (includes compressing the page)
+    warm        repeated full GETs against a warm render cache
+    revalidate  conditional GETs with If-None-Match (expects 304s)
+"""
+import argparse
+import http.client
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+BASELINE_PATH = os.path.join(HERE, "portfolio_bench_baseline.json")
+DEFAULT_CMD = (
+    f'"{sys.executable}" -c "import portfolio; '
+    "portfolio.app.run(host='127.0.0.1', port={port}, threaded=True)\""
+)
+ACCEPT_ENCODING = "br, gzip"
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _rss_kb(pid):
+    """Resident set size of pid and its children in KiB (Linux /proc only)."""
+    total = 0
+    pids = [pid]
+    try:
+        with open(f"/proc/{pid}/task/{pid}/children") as f:
+            pids += [int(p) for p in f.read().split()]
+    except OSError:
+        pass
+    for p in pids:
+        try:
+            with open(f"/proc/{p}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        total += int(line.split()[1])
+        except OSError:
+            pass
+    return total or None
+
+
+class Server:
+    """The portfolio app running in a child process."""
+
+    def __init__(self, cmd):
+        self.port = _free_port()
+        self.cmd = cmd.format(port=self.port)
+        self.proc = None
+
+    def start(self, timeout=30.0):
+        """Start the server; return seconds until it served its first page."""
+        started = time.perf_counter()
+        self.proc = subprocess.Popen(
+            self.cmd, shell=True, cwd=HERE, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        while time.perf_counter() - started < timeout:
+            if self.proc.poll() is not None:
+                raise RuntimeError(f"server exited with code {self.proc.returncode}: {self.cmd}")
+            try:
+                status, _, _ = request(self.port)
+            except OSError:
+                time.sleep(0.02)
+                continue
+            if status == 200:
+                return time.perf_counter() - started
+        raise RuntimeError(f"server did not come up within {timeout}s")
+
+    def stop(self):
+        if self.proc is not None and self.proc.poll() is None:
+            self.proc.terminate()
+            try:
+                self.proc.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.proc.kill()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def request(port, headers=None, conn=None):
+    """GET / and return (status, headers, body)."""
+    own = conn is None
+    if own:
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+    try:
+        conn.request("GET", "/", headers=headers or {})
+        resp = conn.getresponse()
+        return resp.status, dict(resp.getheaders()), resp.read()
+    finally:
+        if own:
+            conn.close()
+
+
+def drive(port, requests, concurrency, headers):
+    """Issue requests across concurrency keep-alive clients; return latencies and wall time."""
+    latencies, errors = [], []
+    lock = threading.Lock()
+    per_client = [requests // concurrency + (i < requests % concurrency) for i in range(concurrency)]
+
+    def client(n):
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+        local = []
+        for _ in range(n):
+            t0 = time.perf_counter()
+            try:
+                status, _, _ = request(port, headers, conn)
+            except (OSError, http.client.HTTPException) as e:
+                conn.close()
+                conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+                with lock:
+                    errors.append(repr(e))
+                continue
+            local.append(time.perf_counter() - t0)
+            if status >= 400:
+                with lock:
+                    errors.append(f"HTTP {status}")
+        conn.close()
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=client, args=(n,)) for n in per_client]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return latencies, time.perf_counter() - started, errors
+
+
+def _percentile(sorted_values, pct):
+    if not sorted_values:
+        return None
+    k = (len(sorted_values) - 1) * pct / 100
+    lo, hi = int(k), min(int(k) + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (k - lo)
+
+
+def summarize(latencies, wall, errors):
+    latencies = sorted(latencies)
+    ms = lambda v: None if v is None else round(v * 1000, 3)
+    return {
+        "requests": len(latencies),
+        "errors": len(errors),
+        "rps": round(len(latencies) / wall, 1) if wall else None,
+        "p50_ms": ms(_percentile(latencies, 50)),
+        "p95_ms": ms(_percentile(latencies, 95)),
+        "p99_ms": ms(_percentile(latencies, 99)),
+        "mean_ms": ms(statistics.fmean(latencies)) if latencies else None,
+    }
+
+
+def page_weight(port):
+    """Byte size of the page for each content-encoding the server negotiates."""
+    sizes = {}
+    for encoding in ("identity", "gzip", "br"):
+        _, headers, body = request(port, {"Accept-Encoding": encoding})
+        served = headers.get("Content-Encoding", "identity")
+        if served == encoding:
+            sizes[encoding] = len(body)
+    return sizes
+
+
+def run(cmd, requests, concurrency):
+    results = {}
+    with Server(cmd) as server:
+        ready = server.start()
+        results["cold"] = {"startup_s": round(ready, 3), "rss_kb": _rss_kb(server.proc.pid)}
+        t0 = time.perf_counter()
+        request(server.port, {"Accept-Encoding": ACCEPT_ENCODING})
+        results["cold"]["first_request_ms"] = round((time.perf_counter() - t0) * 1000, 3)
+
+        results["bytes"] = page_weight(server.port)
+
+        headers = {"Accept-Encoding": ACCEPT_ENCODING}
+        results["warm"] = summarize(*drive(server.port, requests, concurrency, headers))
+        results["warm"]["rss_kb"] = _rss_kb(server.proc.pid)
+
+        _, resp_headers, _ = request(server.port, headers)
+        etag = resp_headers.get("ETag")
+        if etag is None:
+            results["revalidate"] = {"skipped": "server sends no ETag"}
+        else:
+            headers = dict(headers, **{"If-None-Match": etag})
+            results["revalidate"] = summarize(*drive(server.port, requests, concurrency, headers))
+            status, _, _ = request(server.port, headers)
+            results["revalidate"]["status"] = status
+    return results
+
+
+def compare(results, baseline, latency_tolerance, bytes_tolerance):
+    """Return a list of human-readable regressions against baseline."""
+    problems = []
+    for encoding, size in baseline.get("bytes", {}).items():
+        current = results["bytes"].get(encoding)
+        if current is None:
+            problems.append(f"bytes[{encoding}]: no longer served")
+        elif current > size * (1 + bytes_tolerance):
+            problems.append(f"bytes[{encoding}]: {size} -> {current}")
+    for scenario in ("warm", "revalidate"):
+        for key in ("p50_ms", "p95_ms", "p99_ms"):
+            old = baseline.get(scenario, {}).get(key)
+            new = results.get(scenario, {}).get(key)
+            if old and new and new > old * (1 + latency_tolerance):
+                problems.append(f"{scenario}.{key}: {old} -> {new}")
+        old_rps = baseline.get(scenario, {}).get("rps")
+        new_rps = results.get(scenario, {}).get("rps")
+        if old_rps and new_rps and new_rps < old_rps / (1 + latency_tolerance):
+            problems.append(f"{scenario}.rps: {old_rps} -> {new_rps}")
+    if results.get("revalidate", {}).get("status") not in (None, 304):
+        problems.append(f"revalidate: expected 304, got {results['revalidate']['status']}")
+    return problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", "--requests", type=int, default=2000, help="requests per scenario")
+    parser.add_argument("-c", "--concurrency", type=int, default=16, help="concurrent clients")
+    parser.add_argument("--cmd", default=DEFAULT_CMD, help="server command; {port} is substituted")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="baseline JSON file")
+    parser.add_argument("--save-baseline", action="store_true", help="store this run as the baseline")
+    parser.add_argument("--latency-tolerance", type=float, default=0.25, help="allowed fractional latency/rps regression")
+    parser.add_argument("--bytes-tolerance", type=float, default=0.0, help="allowed fractional page-size growth")
+    args = parser.parse_args(argv)
+
+    results = run(args.cmd, args.requests, args.concurrency)
+    print(json.dumps(results, indent=4))
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=4)
+            f.write("\n")
+        print(f"[INFO] Baseline saved to {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        print("[INFO] No baseline to compare against; run with --save-baseline")
+        return 0
+    with open(args.baseline) as f:
+        problems = compare(results, json.load(f), args.latency_tolerance, args.bytes_tolerance)
+    for problem in problems:
+        print(f"[REGRESSION] {problem}")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
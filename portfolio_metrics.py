@@ -0,0 +1,235 @@
+"""Opt-in request timing and profiling for the portfolio app.
+
+Enabled with PORTFOLIO_METRICS=1 (or app.config["METRICS_ENABLED"]). When on:
+
+* every request is split into phases -- routing, render, compress, app
+  (the whole view) and write (streaming the body to the server), plus the
+  end-to-end total -- recorded as Prometheus histograms served on /metrics;
+* the phases known when headers are sent are returned in a Server-Timing
+  header (write happens after the headers, so it only appears in /metrics);
+* template compilation happens once at startup and is exported as a gauge.
+
+Setting PORTFOLIO_PROFILE_SLOW_MS turns on a sampling profiler. Requests
+slower than that many milliseconds have their sampled stacks appended to
+PORTFOLIO_PROFILE_OUTPUT (default profile.folded) in the collapsed
+"frame;frame;frame count" format read by flamegraph.pl and speedscope.
+
+Metrics are per process; under gunicorn each worker reports its own.
+"""
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+from flask import Response, g, has_request_context, request
+
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+
+class Histogram:
+    """Prometheus-style cumulative histogram, one series per label value."""
+
+    def __init__(self, name, help_text, label, buckets=BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.label = label
+        self.buckets = buckets
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, label_value, seconds):
+        with self._lock:
+            series = self._series.get(label_value)
+            if series is None:
+                series = self._series[label_value] = [[0] * len(self.buckets), 0.0, 0]
+            counts = series[0]
+            for i, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    counts[i] += 1
+            series[1] += seconds
+            series[2] += 1
+
+    def expose(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for value, (counts, total, count) in sorted(self._series.items()):
+                label = f'{self.label}="{value}"'
+                for bound, n in zip(self.buckets, counts):
+                    lines.append(f'{self.name}_bucket{{{label},le="{bound}"}} {n}')
+                lines.append(f'{self.name}_bucket{{{label},le="+Inf"}} {count}')
+                lines.append(f"{self.name}_sum{{{label}}} {total}")
+                lines.append(f"{self.name}_count{{{label}}} {count}")
+        return lines
+
+
+class Metrics:
+    def __init__(self):
+        self.phases = Histogram(
+            "portfolio_request_phase_seconds", "Time spent in each phase of a request.", "phase"
+        )
+        self.requests = Counter()
+        self.compile_seconds = None
+        self._lock = threading.Lock()
+
+    def count_request(self, method, status):
+        with self._lock:
+            self.requests[(method, status)] += 1
+
+    def expose(self):
+        lines = self.phases.expose()
+        lines += ["# HELP portfolio_requests_total Requests served.", "# TYPE portfolio_requests_total counter"]
+        with self._lock:
+            for (method, status), n in sorted(self.requests.items()):
+                lines.append(f'portfolio_requests_total{{method="{method}",status="{status}"}} {n}')
+        if self.compile_seconds is not None:
+            lines += [
+                "# HELP portfolio_template_compile_seconds Time taken to compile the page template at startup.",
+                "# TYPE portfolio_template_compile_seconds gauge",
+                f"portfolio_template_compile_seconds {self.compile_seconds}",
+            ]
+        return "\n".join(lines) + "\n"
+
+
+metrics = Metrics()
+_enabled = False
+
+
+@contextmanager
+def phase(name):
+    """Time the enclosed block as a request phase; a no-op when metrics are off."""
+    timings = g.get("_phase_timings") if _enabled and has_request_context() else None
+    if timings is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[name] = timings.get(name, 0.0) + time.perf_counter() - start
+
+
+def _collapse(frame):
+    stack = []
+    while frame is not None:
+        code = frame.f_code
+        stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+        frame = frame.f_back
+    return ";".join(reversed(stack))
+
+
+class SlowRequestProfiler:
+    """Samples the stacks of threads serving requests and dumps the slow ones."""
+
+    def __init__(self, threshold_ms, output, interval_ms=5.0):
+        self.threshold = threshold_ms / 1000.0
+        self.output = output
+        self.interval = interval_ms / 1000.0
+        self._active = {}
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            frames = sys._current_frames()
+            with self._lock:
+                for ident, samples in self._active.items():
+                    frame = frames.get(ident)
+                    if frame is not None:
+                        samples[_collapse(frame)] += 1
+
+    def begin(self):
+        with self._lock:
+            # Started lazily so each forked worker samples its own threads
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="portfolio-profiler", daemon=True)
+                self._thread.start()
+            self._active[threading.get_ident()] = Counter()
+
+    def end(self, seconds):
+        with self._lock:
+            samples = self._active.pop(threading.get_ident(), None)
+        if not samples or seconds < self.threshold:
+            return
+        with open(self.output, "a") as f:
+            f.write("".join(f"{stack} {n}\n" for stack, n in samples.items()))
+
+
+class _TimedBody:
+    """Wraps a WSGI response body to time how long the server takes to write it."""
+
+    def __init__(self, body, environ, profiler):
+        self._body = body
+        self._environ = environ
+        self._profiler = profiler
+        self._start = time.perf_counter()
+
+    def __iter__(self):
+        return iter(self._body)
+
+    def close(self):
+        try:
+            if hasattr(self._body, "close"):
+                self._body.close()
+        finally:
+            now = time.perf_counter()
+            metrics.phases.observe("write", now - self._start)
+            metrics.phases.observe("total", now - self._environ["portfolio.start"])
+            if self._profiler is not None:
+                self._profiler.end(now - self._environ["portfolio.start"])
+
+
+class _TimingMiddleware:
+    def __init__(self, wsgi_app, profiler):
+        self.wsgi_app = wsgi_app
+        self.profiler = profiler
+
+    def __call__(self, environ, start_response):
+        environ["portfolio.start"] = time.perf_counter()
+        if self.profiler is not None:
+            self.profiler.begin()
+        return _TimedBody(self.wsgi_app(environ, start_response), environ, self.profiler)
+
+
+def init_app(app):
+    """Install the instrumentation on app if it is enabled in the environment or config."""
+    global _enabled
+    app.config.setdefault("METRICS_ENABLED", os.environ.get("PORTFOLIO_METRICS", "") not in ("", "0"))
+    app.config.setdefault("PROFILE_SLOW_MS", os.environ.get("PORTFOLIO_PROFILE_SLOW_MS"))
+    app.config.setdefault("PROFILE_OUTPUT", os.environ.get("PORTFOLIO_PROFILE_OUTPUT", "profile.folded"))
+    if not app.config["METRICS_ENABLED"]:
+        return
+    _enabled = True
+
+    profiler = None
+    if app.config["PROFILE_SLOW_MS"]:
+        profiler = SlowRequestProfiler(float(app.config["PROFILE_SLOW_MS"]), app.config["PROFILE_OUTPUT"])
+    app.wsgi_app = _TimingMiddleware(app.wsgi_app, profiler)
+
+    def start_timing():
+        now = time.perf_counter()
+        # Everything before the first before_request hook: context push and URL matching
+        g._phase_timings = {"routing": now - request.environ["portfolio.start"]}
+        g._view_start = now
+
+    def finish_timing(response):
+        timings = g.pop("_phase_timings", None)
+        if timings is None:
+            return response
+        timings["app"] = time.perf_counter() - g.pop("_view_start")
+        for name, seconds in timings.items():
+            metrics.phases.observe(name, seconds)
+        metrics.count_request(request.method, response.status_code)
+        response.headers["Server-Timing"] = ", ".join(
+            f"{name};dur={seconds * 1000:.3f}" for name, seconds in timings.items()
+        )
+        return response
+
+    app.before_request_funcs.setdefault(None, []).insert(0, start_timing)
+    app.after_request(finish_timing)
+
+    @app.route("/metrics")
+    def prometheus_metrics():
+        return Response(metrics.expose(), mimetype="text/plain; version=0.0.4")